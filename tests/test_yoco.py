@@ -35,6 +35,31 @@ def test_config_from_file() -> None:
     assert loaded_dict == expected_dict
 
 
+def test_config_from_invalid_file(tmp_path: str) -> None:
+    """Test that files not containing a mapping raise an error."""
+    file_path = tmp_path / "list.yaml"
+    file_path.write_text("- ab\n- cd\n")
+    with pytest.raises(TypeError, match="does not contain a mapping"):
+        yoco.load_config_from_file(file_path)
+
+    # also when included, even though the list could be converted to a dict
+    yoco.save_config_to_file(tmp_path / "a.yaml", {"config": ["./list.yaml"]})
+    with pytest.raises(TypeError, match="does not contain a mapping"):
+        yoco.load_config_from_file(tmp_path / "a.yaml")
+
+
+def test_recursive_alias(tmp_path: str) -> None:
+    """Test that recursive aliases raise an error, other aliases can be loaded."""
+    file_path = tmp_path / "test.yaml"
+    for content in ["a: &x {b: *x}\n", "a: &x [1, *x]\n"]:
+        file_path.write_text(content)
+        with pytest.raises(ValueError, match="Recursive alias"):
+            yoco.load_config_from_file(file_path)
+
+    file_path.write_text("a: &x {b: [1]}\nc: *x\n")
+    assert yoco.load_config_from_file(file_path) == {"a": {"b": [1]}, "c": {"b": [1]}}
+
+
 def test_load_config() -> None:
     """Test loading a config through a predefined config dictionary.
 
@@ -100,6 +125,16 @@ def test_load_config() -> None:
     assert d2_copy == d2
     assert d3 == expected_dict
 
+    # shared and recursive values are copied like with copy.deepcopy
+    shared = {"a": 1}
+    recursive = [1]
+    recursive.append(recursive)
+    d1 = {"config": "tests/test_files/config_1.yaml"}
+    d2 = {"shared_1": shared, "shared_2": shared, "recursive": recursive}
+    d3 = yoco.load_config(d1, d2)
+    assert d3["shared_1"] is d3["shared_2"] and d3["shared_1"] is not shared
+    assert d3["recursive"][1] is d3["recursive"] and d3["recursive"] is not recursive
+
 
 def test_save_config(tmp_path: str) -> None:
     """Test saving the config to file.
@@ -112,6 +147,19 @@ def test_save_config(tmp_path: str) -> None:
     yoco.save_config_to_file(file_path, original_dict)
     new_dict = yoco.load_config_from_file(file_path)
     assert original_dict == new_dict
+    assert list(original_dict) == list(new_dict)  # same order of keys
+
+
+def test_compile_config(tmp_path: str) -> None:
+    """Test compiling a config with included files into a single file."""
+    compiled_path = tmp_path / "compiled.yaml"
+    yoco.compile_config_to_file("tests/test_files/1.yaml", compiled_path)
+
+    # relative paths are absolute in the compiled file
+    expected_dict = yoco.load_config_from_file("tests/test_files/1.yaml")
+    expected_dict["test_path"] = os.path.abspath(expected_dict["test_path"])
+    expected_dict["rel_path"] = os.path.abspath(expected_dict["rel_path"])
+    assert yoco.load_config_from_file(compiled_path) == expected_dict
 
 
 def test_include() -> None:
@@ -129,6 +177,19 @@ def test_include() -> None:
     assert loaded_dict == expected_dict
 
 
+def test_unknown_tag(tmp_path: str) -> None:
+    """Test that values with unknown tags are loaded as plain values."""
+    file_path = tmp_path / "test.yaml"
+    file_path.write_text("a: !foo bar\nb: !foo [1, 2]\nc: !foo {d: 1}\n")
+    expected_dict = {"a": "bar", "b": [1, 2], "c": {"d": 1}}
+    assert yoco.load_config_from_file(file_path) == expected_dict
+
+    # same for !include tags of sequences and mappings, only scalars are included
+    file_path.write_text("a: !include [x, y]\nb: !include {k: v}\n")
+    expected_dict = {"a": ["x", "y"], "b": {"k": "v"}}
+    assert yoco.load_config_from_file(file_path) == expected_dict
+
+
 def test_nested_config() -> None:
     """Test loading with multiple nested config files.
 
@@ -159,6 +220,28 @@ def test_nested_config() -> None:
     assert original_dict == expected_dict
 
 
+def test_diamond_config() -> None:
+    """Test loading a config whose parents share a common parent.
+
+    start -> diamond
+              |    |
+            left  right
+              |    |
+              base
+
+    The shared parent is merged at both positions, i.e., for right it overwrites left.
+    """
+    config_dict = yoco.load_config_from_file("tests/test_files/diamond.yaml")
+    expected_dict = {
+        "base_only": "base",
+        "left_and_base": "base",  # base.yaml is merged again as parent of right.yaml
+        "left_only": "left",
+        "right_only": "right",
+        "diamond": "top",
+    }
+    assert config_dict == expected_dict
+
+
 def test_namespaces() -> None:
     """Test loading config with namespaces.
 
@@ -216,6 +299,35 @@ def test_config_from_parser() -> None:
     expected_dict = {"a": {"b": {"c": 1}}}
     assert config_dict == expected_dict
 
+    # key and value in same arg
+    parser = argparse.ArgumentParser()
+    config_dict = yoco.load_config_from_args(parser, args=["--a.b=1", "--c=x", "y"])
+    expected_dict = {"a": {"b": 1}, "c": "x y"}
+    assert config_dict == expected_dict
+
+    # values are parsed the same as in YAML files
+    values = ["True", "NULL", "1.5", "01", "a/b.c", "x y"]
+    parser = argparse.ArgumentParser()
+    config_dict = yoco.load_config_from_args(
+        parser, args=[f"--v{i}={value}" for i, value in enumerate(values)]
+    )
+    expected_dict = {
+        "v0": True,
+        "v1": None,
+        "v2": 1.5,
+        "v3": 1,
+        "v4": "a/b.c",
+        "v5": "x y",
+    }
+    assert config_dict == expected_dict
+    for i, value in enumerate(values):
+        assert config_dict[f"v{i}"] == yoco._get_yaml().load(value)
+
+    # lists of numbers
+    parser = argparse.ArgumentParser()
+    config_dict = yoco.load_config_from_args(parser, args=["--steps", "[10, 20]"])
+    assert config_dict == {"steps": [10, 20]}
+
     # nested config
     parser = argparse.ArgumentParser()
     config_dict = yoco.load_config_from_args(
@@ -356,6 +468,28 @@ def test_config_from_parser() -> None:
     }
     assert config_dict == expected_dict
 
+    # fourth case: optional positional args, argparse inserts their defaults itself
+    positional_parser = argparse.ArgumentParser()
+    positional_parser.add_argument("test", nargs="?", type=int, default=3)
+    positional_parser.add_argument("other", nargs="*", default=[1])
+    positional_parser.add_argument("--config")
+    config_dict = yoco.load_config_from_args(
+        positional_parser, args=["--config", "tests/test_files/test_1.yaml"]
+    )
+    expected_dict = {
+        "test": 1,  # provided config has higher priority than default value
+        "other": [],  # like an empty positional argument
+    }
+    assert config_dict == expected_dict
+
+    config_dict = yoco.load_config_from_args(positional_parser, args=[])
+    assert config_dict == {"test": 3, "other": []}
+
+    config_dict = yoco.load_config_from_args(
+        positional_parser, args=["4", "5", "--config", "tests/test_files/test_1.yaml"]
+    )
+    assert config_dict == {"test": 4, "other": ["5"]}
+
     # search path when loading from args
     config_dict = yoco.load_config_from_args(
         parser,
@@ -368,6 +502,40 @@ def test_config_from_parser() -> None:
     }
     assert config_dict == expected_dict
 
+    # keys are in the order of the parser's actions, independent of the given args
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--test", type=int, default=3)
+    parser.add_argument("--flag", action="store_true")
+    parser.add_argument("--lst", nargs="+", type=int, default=[1])
+    parser.set_defaults(extra=5)
+    config_dict = yoco.load_config_from_args(parser, args=["--lst", "1", "2"])
+    assert list(config_dict) == ["test", "flag", "lst", "extra"]
+    config_dict = yoco.load_config_from_args(parser, args=["--test", "7", "--new=1"])
+    assert list(config_dict) == ["test", "flag", "lst", "extra", "new"]
+
+    # like argparse, suppressed defaults fall back to other actions with the same dest
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--a", default=argparse.SUPPRESS)
+    parser.add_argument("--b", dest="a", type=int, default=5)
+    assert yoco.load_config_from_args(parser, args=[]) == {"a": 5}
+
+    # invalid default values are reported like invalid args
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default="abc")
+    with pytest.raises(SystemExit):
+        yoco.load_config_from_args(parser, args=[])
+    assert yoco.load_config_from_args(parser, args=["--n", "1"]) == {"n": 1}
+
+    # values which can't be copied, default values are not shared with the parser
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--f", type=argparse.FileType("r"), default="setup.py")
+    parser.add_argument("--lst", nargs="+", default=[1])
+    for args in [[], ["--f", "setup.cfg"]]:
+        config_dict = yoco.load_config_from_args(parser, args=args)
+        config_dict["f"].close()
+        config_dict["lst"].append(2)
+    assert parser.get_default("lst") == [1]
+
 
 def test_paths(monkeypatch: pytest.MonkeyPatch) -> None:
     """Test resolving of paths with searchpaths and homefolder."""
@@ -387,3 +555,84 @@ def test_paths(monkeypatch: pytest.MonkeyPatch) -> None:
         "my_var": 2.3,
     }
     assert config_dict == expected_dict
+
+
+def test_modified_file(tmp_path: str) -> None:
+    """Test that modified files are loaded again instead of using the cached content."""
+    file_path = tmp_path / "test.yaml"
+    yoco.save_config_to_file(file_path, {"a": 1})
+    assert yoco.load_config_from_file(file_path) == {"a": 1}
+
+    # ensure the cached content is not modified through the returned dictionary
+    yoco.load_config_from_file(file_path)["a"] = 3
+    assert yoco.load_config_from_file(file_path) == {"a": 1}
+
+    yoco.save_config_to_file(file_path, {"a": 2, "b": 2})
+    assert yoco.load_config_from_file(file_path) == {"a": 2, "b": 2}
+
+    # same for nested values, including files with !include tags and relative paths
+    yoco.save_config_to_file(file_path, {"a": {"b": [1]}})
+    yoco.load_config_from_file(file_path)["a"]["b"].append(2)
+    assert yoco.load_config_from_file(file_path) == {"a": {"b": [1]}}
+    yoco.save_config_to_file(file_path, {"a": {"b": [1]}, "c": "./c"})
+    yoco.load_config_from_file(file_path)["a"]["b"].append(2)
+    assert yoco.load_config_from_file(file_path)["a"] == {"b": [1]}
+
+    # files added to or removed from search paths are found / skipped
+    search_paths = [str(tmp_path / "first"), str(tmp_path)]
+    assert yoco.resolve_path("test.yaml", None, search_paths) == str(file_path)
+    os.mkdir(tmp_path / "first")
+    yoco.save_config_to_file(tmp_path / "first" / "test.yaml", {"a": 3})
+    assert yoco.load_config_from_file("test.yaml", search_paths=search_paths) == {
+        "a": 3
+    }
+    os.remove(tmp_path / "first" / "test.yaml")
+    assert yoco.load_config_from_file("test.yaml", search_paths=search_paths) == {
+        "a": {"b": [1]},
+        "c": str(tmp_path / "c"),
+    }
+
+
+def test_clear_cache(tmp_path: str) -> None:
+    """Test that clear_cache discards cached file content."""
+    file_path = tmp_path / "test.yaml"
+    yoco.save_config_to_file(file_path, {"a": 1})
+    stat = os.stat(file_path)
+    assert yoco.load_config_from_file(file_path) == {"a": 1}
+
+    # same size and modification time, not detected as modified
+    yoco.save_config_to_file(file_path, {"a": 2})
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert yoco.load_config_from_file(file_path) == {"a": 1}
+
+    yoco.clear_cache()
+    assert yoco.load_config_from_file(file_path) == {"a": 2}
+
+
+def test_circular_config(tmp_path: str) -> None:
+    """Test that circular configs raise an error instead of loading forever."""
+    yoco.save_config_to_file(tmp_path / "a.yaml", {"config": "./b.yaml", "a": 1})
+    yoco.save_config_to_file(tmp_path / "b.yaml", {"config": ["./c.yaml"], "b": 1})
+    yoco.save_config_to_file(tmp_path / "c.yaml", {"config": {"x": "./a.yaml"}})
+    with pytest.raises(ValueError, match="Circular config"):
+        yoco.load_config_from_file(tmp_path / "a.yaml")
+
+    # files can still be included multiple times if they do not include themselves
+    yoco.save_config_to_file(tmp_path / "c.yaml", {"config": {"x": "./d.yaml"}})
+    yoco.save_config_to_file(tmp_path / "d.yaml", {"d": 1})
+    yoco.save_config_to_file(tmp_path / "b.yaml", {"config": ["./c.yaml", "./d.yaml"]})
+    config_dict = yoco.load_config_from_file(tmp_path / "a.yaml")
+    assert config_dict == {"x": {"d": 1}, "d": 1, "a": 1}
+
+
+def test_many_files(tmp_path: str) -> None:
+    """Test loading many files at once."""
+    file_names = []
+    expected_dict = {}
+    for i in range(16):
+        file_dict = {f"param_{i}_{j}": j for j in range(200)}
+        file_names.append(f"{i}.yaml")
+        yoco.save_config_to_file(tmp_path / file_names[-1], file_dict)
+        expected_dict.update(file_dict)
+    yoco.save_config_to_file(tmp_path / "main.yaml", {"config": file_names})
+    assert yoco.load_config_from_file(tmp_path / "main.yaml") == expected_dict
@@ -6,14 +6,84 @@ command line, YAML-files or directly from a Python dictionary.
 """
 
 import argparse as _argparse
+import ast as _ast
 import copy
+import dataclasses as _dataclasses
+import functools as _functools
 import os as _os
-from typing import Any, List, Optional
+import re as _re
+import sys as _sys
+import threading as _threading
+from typing import Any, List, Optional, Tuple
 
 from ruamel.yaml import YAML as _YAML
-from ruamel.yaml import comments as _YAMLComments
+from ruamel.yaml import constructor as _YAMLConstructor
+from ruamel.yaml import nodes as _YAMLNodes
 
-_yaml = _YAML()
+
+@_dataclasses.dataclass(eq=False)  # compared by identity, e.g., as mapping keys
+class _IncludeTag:
+    """Value of an !include tag, i.e., one or multiple paths separated by spaces."""
+
+    value: str
+
+
+class _Constructor(_YAMLConstructor.SafeConstructor):
+    """Safe constructor which additionally handles YOCO's !include tag."""
+
+
+def _construct_unknown(
+    constructor: _YAMLConstructor.SafeConstructor, node: _YAMLNodes.Node
+) -> Any:
+    # unknown tags are ignored, i.e., tagged values are loaded as plain values
+    if isinstance(node, _YAMLNodes.ScalarNode):
+        return constructor.construct_scalar(node)
+    elif isinstance(node, _YAMLNodes.SequenceNode):
+        return constructor.construct_sequence(node, deep=True)
+    return constructor.construct_mapping(node, deep=True)
+
+
+def _construct_include(
+    constructor: _YAMLConstructor.SafeConstructor, node: _YAMLNodes.Node
+) -> Any:
+    if not isinstance(node, _YAMLNodes.ScalarNode):
+        # only scalars are included, tagged sequences and mappings are plain values
+        return _construct_unknown(constructor, node)
+    return _IncludeTag(constructor.construct_scalar(node))
+
+
+_Constructor.add_constructor("!include", _construct_include)
+_Constructor.add_constructor(None, _construct_unknown)
+
+
+def _create_yaml() -> _YAML:
+    # safe loader / dumper uses libyaml (ruamel.yaml.clib) if available, pure Python
+    # implementation otherwise
+    yaml = _YAML(typ="safe", pure=False)
+    yaml.Constructor = _Constructor
+    yaml.default_flow_style = False  # same block style as the round-trip dumper
+    yaml.sort_base_mapping_type_on_output = False  # keep key order like the latter
+    return yaml
+
+
+# YAML instances store the state of the current load / dump, so they can't be shared
+# between threads (e.g., when configs are loaded from multiple threads)
+_thread_local = _threading.local()
+
+
+def _get_yaml() -> _YAML:
+    """Return the YAML instance of the current thread.
+
+    The instance is created on first use and reused afterwards, which halves the
+    time to load a small file compared to a new instance per load.
+    """
+    yaml = getattr(_thread_local, "yaml", None)
+    if yaml is None:
+        yaml = _thread_local.yaml = _create_yaml()
+    if hasattr(yaml, "doc_infos"):
+        # ruamel.yaml adds an entry per loaded document, but never removes them again
+        yaml.doc_infos.clear()
+    return yaml
 
 
 def load_config_from_args(
@@ -24,7 +94,8 @@ def load_config_from_args(
     """Parse arguments and load configs into a config dictionary.
 
     Strings following -- will be used as key. Dots in that string are used to access
-    nested dictionaries. YAML will be used for type conversion of the value.
+    nested dictionaries. YAML will be used for type conversion of the value. The value
+    can also be given in the same arg, separated by =, i.e., --key=value.
 
     Args:
         parser:
@@ -41,68 +112,85 @@ def load_config_from_args(
         Loaded configuration dictionary.
     """
     # parse arguments
-    no_default_parser = copy.deepcopy(parser)
-    for a in no_default_parser._actions:
-        if a.dest != "config":
-            a.default = None
-    known, other_args = no_default_parser.parse_known_args(args)
-
-    known_with_default, _ = parser.parse_known_args(args)
-
-    config_dict = {k: v for k, v in vars(known).items() if v is not None}
-    with_default_config_dict = {
-        k: v for k, v in vars(known_with_default).items() if v is not None
+    # argparse only sets defaults for attributes missing in the namespace, so
+    # providing None for all of them (except config) yields only the given args
+    namespace = _argparse.Namespace(
+        **{a.dest: None for a in parser._actions if a.dest != "config"}
+    )
+    args_parser = _parser_without_positional_defaults(parser)
+    known, other_args = args_parser.parse_known_args(args, namespace)
+
+    # parsed values are owned by this function, only dicts and lists are copied, since
+    # they might be defaults or constants of the parser
+    config_dict = {
+        k: (_fast_deepcopy(v) if isinstance(v, (dict, list)) else v)
+        for k, v in vars(known).items()
+        if v is not None
     }
+    with_default_config_dict = _add_parser_defaults(parser, known, config_dict)
     with_default_config_dict.pop("config", None)
 
-    config_dict = load_config(config_dict, search_paths=search_paths)
+    # same as load_config, without copying the parsed values again
+    if "config" in config_dict:
+        loaded_dict = _resolve_config_key(config_dict, {}, None, search_paths)
+        del config_dict["config"]
+        config_dict = _merge_dictionaries(loaded_dict, config_dict)
     current_key = None
+    current_values = []
 
     # list of unknown args (all strings) to dictionary
-    # [--arg_1, val_1, --arg_2, val_2_a, val_2_b, ...]
-    # -> {arg_1: val_1, arg_2: "{val_2_a} {val_2_b}, ...}
+    # [--arg_1, val_1, --arg_2, val_2_a, val_2_b, --arg_3=val_3, ...]
+    # -> {arg_1: val_1, arg_2: "{val_2_a} {val_2_b}", arg_3: val_3, ...}
     arg_dict = {}
     for arg in other_args:
         if arg.startswith("--"):
-            current_key = arg.replace("--", "")
-            arg_dict[current_key] = []
+            if current_key is not None:
+                arg_dict[current_key] = " ".join(current_values)
+            current_key, has_value, value = arg[2:].partition("=")
+            current_values = [value] if has_value else []
         else:
             if current_key is None:
                 parser.error(
                     message="General args need to start with --name {values}\n"
                 )
-            arg_dict[current_key].append(arg)
-    arg_dict = {key: " ".join(values) for key, values in arg_dict.items()}
+            current_values.append(arg)
+    if current_key is not None:
+        arg_dict[current_key] = " ".join(current_values)
     # done parsing args, stored in arg_dict
 
     # integrate arg, value pairs into config_dict loaded before, one by one
     # args can set nested values by using dots
-    # i.e., a.b.c will result in the following add_dict: {"a": {"b": {"c": value}}}
+    # i.e., a.b.c will set config_dict["a"]["b"]["c"]
     # "config" can still be used to load files
     for arg, value in arg_dict.items():
-        add_dict = {}
-        current_dict = add_dict
-        hierarchy = arg.split(".")
-        for a in hierarchy[:-1]:
-            current_dict[a] = {}
-            current_dict = current_dict[a]
+        # interned like the keys of loaded files, see _intern_keys
+        hierarchy = [_sys.intern(a) for a in arg.split(".")]
         # parse value using yaml (this allows setting lists, dictionaries, etc.)
-        current_dict[hierarchy[-1]] = _yaml.load(value)
+        value = _fast_yaml_load(value)
 
         if hierarchy[0] == "config":
             # handle special "config" key by loading the nested dict as root dict
             # this will practically replace "config" key with the dict from
             # the specified file
+            # i.e., config.a.b will result in add_dict: {"config": {"a": {"b": value}}}
+            add_dict = value
+            for a in reversed(hierarchy):
+                add_dict = {a: add_dict}
             add_dict = load_config(add_dict, search_paths=search_paths)
             # config file -> lower priority than what is already there
             config_dict = load_config(config_dict, add_dict, search_paths=search_paths)
         else:
-            # integrate nested dictionary into config_dict loaded before
+            # set nested value in config_dict loaded before
             # normal argument -> higher priority than what is arleady there
-            config_dict = load_config(add_dict, config_dict)
+            value = _resolve_recursively(value, None, None, resolve_paths=False)
+            _set_nested_value(config_dict, hierarchy, value)
 
     # add default values last (lowest priority) if they weren't specified so far
-    config_dict = _merge_dictionaries(with_default_config_dict, config_dict)
+    # defaults are owned (see _add_parser_defaults) and might not be copyable, e.g.,
+    # open files from argparse.FileType
+    config_dict = _merge_dictionaries(
+        with_default_config_dict, config_dict, copy_start_values=False
+    )
 
     return config_dict
 
@@ -133,15 +221,7 @@ def load_config_from_file(
     if current_dict is None:
         current_dict = {}
 
-    full_path = resolve_path(path, parent, search_paths)
-
-    parent = _os.path.dirname(full_path)
-
-    with open(full_path) as f:
-        config_dict = _yaml.load(f)
-        current_dict = load_config(config_dict, current_dict, parent, search_paths)
-
-    return current_dict
+    return _load_config_files(_os.fspath(path), current_dict, parent, search_paths)
 
 
 def load_config(
@@ -166,28 +246,30 @@ def load_config(
     Returns:
         Loaded / updated configuration dictionary.
     """
-    config_dict = copy.deepcopy(config_dict)
     if current_dict is None:
         current_dict = {}
-    else:
-        current_dict = copy.deepcopy(current_dict)
+
+    # neither config_dict nor current_dict are modified, the following steps create
+    # new dictionaries instead
 
     # 1. handle config key if present
     if "config" in config_dict:
         current_dict = _resolve_config_key(
             config_dict, current_dict, parent, search_paths
         )
+        config_dict = dict(config_dict)  # shallow copy, config_dict is not modified
+        del config_dict["config"]
 
-    config_dict.pop("config", None)
-
-    # 2. handle !include tag
-    config_dict = _resolve_include_tags_recursively(config_dict, parent, search_paths)
-
-    # 3. resolve automatically recognized paths (./, ../, ~)
-    if parent is not None:
-        _resolve_paths_recursively(config_dict, parent)
+    # 2. handle !include tag and 3. resolve automatically recognized paths (./, ../, ~)
+    # both are handled in a single pass
+    config_dict = _resolve_recursively(
+        config_dict, parent, search_paths, resolve_paths=parent is not None
+    )
 
     # 4. merge config_dict into current_dict
+    if not current_dict:
+        # nothing to merge, config_dict has been created by step 2
+        return config_dict
     current_dict = _merge_dictionaries(current_dict, config_dict)
 
     return current_dict
@@ -234,21 +316,31 @@ def resolve_path(
         parent = "."
 
     # handle paths starting with / or ~
-    if _os.path.isabs(path):
+    if path.startswith("/") if _POSIX else _os.path.isabs(path):
         return _os.path.normpath(path)
     elif path.startswith("~/"):
         return _os.path.normpath(_os.path.expanduser(path))
 
     # handle paths starting with . or ..
-    parts = path.split(_os.sep)
-    if parts[0] in [".", ".."]:
-        return _os.path.normpath(_os.path.join(parent, path))
+    if path.partition(_os.sep)[0] in (".", ".."):
+        return _os.path.normpath(_join(parent, path))
 
     # handle paths without prefix
+    if not search_paths:
+        return path
+
     for search_path in search_paths:
-        resolved_path = resolve_path(_os.path.join(search_path, path), parent, [])
-        if _os.path.exists(resolved_path):
-            return _os.path.normpath(resolved_path)
+        # same as resolve_path(_join(search_path, path), parent, []), inlined
+        candidate = _join(search_path, path)
+        if candidate.startswith("/") if _POSIX else _os.path.isabs(candidate):
+            candidate = _os.path.normpath(candidate)
+        elif candidate.startswith("~/"):
+            candidate = _os.path.normpath(_os.path.expanduser(candidate))
+        elif candidate.partition(_os.sep)[0] in (".", ".."):
+            candidate = _os.path.normpath(_join(parent, candidate))
+        if _os.path.exists(candidate):
+            # candidates without prefix are checked before normalizing them
+            return _os.path.normpath(candidate)
 
     return path
 
@@ -256,146 +348,648 @@ def resolve_path(
 def save_config_to_file(path: str, config_dict: dict) -> None:
     """Save config dictionary as a yaml file."""
     with open(path, "w") as f:
-        _yaml.dump(config_dict, f)
+        _get_yaml().dump(config_dict, f)
+
+
+def compile_config_to_file(
+    path: str, compiled_path: str, search_paths: Optional[List[str]] = None
+) -> None:
+    """Load a config file and save it with all included files merged into it.
+
+    The compiled file contains no config keys and no !include tags, so loading it
+    does not require reading any other file. Relative paths (./, ../) are resolved
+    as when loading the config file. Since path is made absolute first, they become
+    absolute paths, which stay valid if the compiled file is moved (unless they are
+    from a file found through the search path "", i.e., the current directory).
+
+    Args:
+        path: Path of YAML file to compile.
+        compiled_path: Path of the compiled YAML file.
+        search_paths:
+            Search paths used to resolve config files.
+            See resolve_path for more information.
+    """
+    full_path = _os.path.abspath(resolve_path(_os.fspath(path), None, search_paths))
+    config_dict = load_config_from_file(full_path, search_paths=search_paths)
+    save_config_to_file(compiled_path, config_dict)
+
+
+def clear_cache() -> None:
+    """Clear cached file contents.
+
+    Files are parsed again if their modification time or size changes, so this is
+    only necessary if a file is modified without changing either of them (e.g., on
+    file systems with coarse timestamps) or to free memory. Search paths are not
+    cached, files added to or removed from them are always taken into account.
+    """
+    _parse_yaml_file.cache_clear()
+
+
+# on POSIX, paths are handled with plain string operations, which avoids the generic
+# (and comparably slow) implementations of os.path
+_POSIX = _os.sep == "/" and _os.altsep is None
+
+
+def _join(path: str, relative_path: str) -> str:
+    """Join two paths, the second one must be relative."""
+    if not _POSIX:
+        return _cached_os_join(path, relative_path)
+    if not path or path.endswith("/"):
+        return path + relative_path
+    return path + "/" + relative_path
+
+
+def _dirname(path: str) -> str:
+    """Return the directory name of a normalized path."""
+    if not _POSIX:
+        return _cached_os_dirname(path)
+    head = path.rpartition("/")[0]
+    if not head and path.startswith("/"):
+        return "/"
+    return head
+
+
+# other platforms use os.path, the same few paths are joined many times, e.g., the
+# directory of a file with each of its relative paths
+@_functools.lru_cache(maxsize=1024)
+def _cached_os_join(path: str, relative_path: str) -> str:
+    return _os.path.join(path, relative_path)
+
+
+@_functools.lru_cache(maxsize=1024)
+def _cached_os_dirname(path: str) -> str:
+    return _os.path.dirname(path)
+
+
+def _parser_without_positional_defaults(
+    parser: _argparse.ArgumentParser,
+) -> _argparse.ArgumentParser:
+    """Return a parser that does not insert defaults of optional positional args.
+
+    Unlike for other args, argparse inserts the default of positional args with
+    nargs ? or * itself if they are not given, even if the namespace already
+    contains a value. For parsers with such args, a copy without their defaults
+    (except config) is returned, otherwise the parser itself.
+
+    Args:
+        parser: The parser. Will not be modified.
+
+    Returns:
+        Parser which can be used to parse the given args only.
+    """
+
+    def inserts_default(a: _argparse.Action) -> bool:
+        return (
+            not a.option_strings
+            and a.nargs in (_argparse.OPTIONAL, _argparse.ZERO_OR_MORE)
+            and a.default is not None
+            and a.dest != "config"
+        )
+
+    if not any(inserts_default(a) for a in parser._actions):
+        return parser
+    parser = copy.deepcopy(parser)
+    for a in parser._actions:
+        if inserts_default(a):
+            a.default = None
+    return parser
+
+
+def _add_parser_defaults(
+    parser: _argparse.ArgumentParser, namespace: _argparse.Namespace, args_dict: dict
+) -> dict:
+    """Add the defaults of a parser's actions for all args that have not been given.
+
+    Same as parsing the args again including defaults, i.e., keys are in the order of
+    the namespace argparse would return.
+
+    Args:
+        parser: The parser whose defaults are added.
+        namespace: Namespace returned by parser, determines the order of the keys.
+        args_dict: Given args, as parsed by parser without defaults.
+
+    Returns:
+        Dictionary containing the given args and defaults of the remaining ones.
+        Default dicts and lists are copied, other defaults are immutable or created
+        by type conversion.
+    """
+    # like argparse, use the first action per dest whose default is not suppressed
+    default_actions = {}
+    for a in parser._actions:
+        if a.dest not in default_actions and a.default is not _argparse.SUPPRESS:
+            default_actions[a.dest] = a
+    with_default_dict = {}
+    # actions not in the namespace (i.e., config) are added last
+    for key in (*vars(namespace), *default_actions):
+        if key in with_default_dict:
+            continue
+        if key in args_dict:
+            with_default_dict[key] = args_dict[key]
+            continue
+        a = default_actions.get(key)
+        # identity checks, since defaults can be array-like (== would be element-wise)
+        if a is None or a.default is None:
+            continue
+        if isinstance(a.default, str):
+            # argparse applies type conversion to string defaults
+            try:
+                with_default_dict[key] = parser._get_value(a, a.default)
+            except _argparse.ArgumentError as err:
+                parser.error(str(err))  # same as argparse for invalid defaults
+        elif isinstance(a.default, (dict, list)):
+            # copied, so the returned dictionary owns all its values
+            with_default_dict[key] = _fast_deepcopy(a.default)
+        else:
+            with_default_dict[key] = a.default
+    return with_default_dict
+
+
+# values which YAML would load as plain strings, ints or floats, respectively
+_BARE_WORD_RE = _re.compile(r"[A-Za-z_][A-Za-z0-9_./\-]*")
+_BARE_WORD_KEYWORDS = {"true", "false", "null"}  # lower case, YAML accepts variants
+_INT_RE = _re.compile(r"[-+]?[0-9]+")
+_FLOAT_RE = _re.compile(r"[-+]?[0-9]+\.[0-9]+")
+# lists of numbers, Python literals and YAML flow sequences agree on these
+_NUMBER = r"[-+]?(?:[0-9][0-9_]*(?:\.[0-9_]*)?|\.[0-9][0-9_]*)"
+_WHITESPACE = r"[ \t\r\n]*"  # \s would also match characters YAML rejects
+_NUMBER_LIST_RE = _re.compile(
+    rf"\[{_WHITESPACE}(?:{_NUMBER}{_WHITESPACE},{_WHITESPACE})*"
+    rf"(?:{_NUMBER}{_WHITESPACE})?\]"
+)
+
+
+def _fast_yaml_load(value: str) -> Any:
+    """Load a YAML value given as string, avoiding the YAML parser for simple values.
+
+    Command line values are mostly single words, numbers or lists of numbers, for
+    which parsing YAML is comparably slow. These are converted directly (lists with
+    ast.literal_eval), all other values are parsed as YAML.
+
+    Args:
+        value: The string to load.
+
+    Returns:
+        Same as loading value with the YAML instance of _get_yaml.
+    """
+    if _BARE_WORD_RE.fullmatch(value):
+        if value.lower() not in _BARE_WORD_KEYWORDS:
+            return value
+    elif _INT_RE.fullmatch(value):
+        return int(value)
+    elif _FLOAT_RE.fullmatch(value):
+        return float(value)
+    elif _NUMBER_LIST_RE.fullmatch(value):
+        try:
+            return _ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            pass  # e.g., leading zeros, let YAML handle it
+    return _get_yaml().load(value)
+
+
+def _load_yaml_file(path: str) -> Tuple[Any, bool]:
+    """Load a YAML file, reusing the parsed content if the file has not changed.
+
+    Files are identified by their absolute path, modification time and size, so
+    edited files are automatically parsed again. A cache hit only requires a stat
+    call and, for relative paths, getting the current working directory.
+
+    Args:
+        path: Path of YAML file to load.
+
+    Returns:
+        Parsed content of the file and whether it needs to be resolved (see
+        _needs_resolving). The content is shared with the cache and must not be
+        modified.
+    """
+    stat = _os.stat(path)
+    return _parse_yaml_file(_os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+@_functools.lru_cache(maxsize=256)
+def _parse_yaml_file(path: str, mtime_ns: int, size: int) -> Tuple[Any, bool]:
+    # mtime_ns and size are only part of the cache key
+    # binary mode, the YAML reader detects and decodes the encoding itself
+    # reading at once avoids the reader's chunked reads and closes the file earlier
+    with open(path, "rb") as f:
+        data = f.read()
+    content = _get_yaml().load(data)
+    try:
+        content = _intern_keys(content)
+    except ValueError as err:
+        raise ValueError(f"Can't load config file {path}: {err}") from None
+    return content, _needs_resolving(content)
+
+
+def _intern_keys(obj: Any, memo: Optional[dict] = None) -> Any:
+    """Intern all string keys of dictionaries in a parsed YAML file.
+
+    The same keys usually appear in many files. Interned keys can be compared by
+    identity when looking them up or merging dictionaries.
+
+    Values used multiple times (i.e., YAML aliases) are only interned once and stay
+    shared. Recursive values (i.e., aliases inside their own anchor) raise a
+    ValueError, since configurations can't contain cycles.
+
+    Args:
+        obj: Parsed YAML content.
+        memo: Interned dicts and lists by id of the parsed ones, None while interning.
+
+    Returns:
+        Parsed YAML content with interned string keys.
+    """
+    if not isinstance(obj, (dict, list)):
+        return obj
+    if memo is None:
+        memo = {}
+    elif id(obj) in memo:
+        if memo[id(obj)] is None:
+            raise ValueError("Recursive alias, i.e., alias inside its own anchor")
+        return memo[id(obj)]
+    memo[id(obj)] = None
+    if isinstance(obj, dict):
+        interned = {
+            (_sys.intern(key) if type(key) is str else key): _intern_keys(value, memo)
+            for key, value in obj.items()
+        }
+    else:
+        interned = [_intern_keys(value, memo) for value in obj]
+    memo[id(obj)] = interned
+    return interned
+
+
+def _needs_resolving(obj: Any) -> bool:
+    """Check whether parsed YAML content might be changed by _resolve_recursively.
+
+    This is the case for content with !include tags or relative paths. Content
+    without either can be used as is, which saves creating a resolved copy of it.
+
+    Args:
+        obj: Parsed YAML content.
+
+    Returns:
+        False if resolving the content would return an equal copy. True otherwise,
+        including all content with types other than dicts, lists and scalars.
+    """
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if type(obj) is dict:
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif type(obj) is list:
+            stack.extend(obj)
+        elif type(obj) not in _IMMUTABLE_TYPES:
+            return True  # e.g., _IncludeTag
+        elif type(obj) is str and obj.startswith(("./", "../", "~/")):
+            return True
+    return False
 
 
 def _resolve_config_key(
     config_dict: dict, current_dict: dict, parent: str, search_paths: List[str]
 ) -> dict:
     # config can be string, list of strings, dict, or list of string / dict
-    if isinstance(config_dict["config"], str):
-        return load_config_from_file(
-            config_dict["config"], current_dict, parent, search_paths
-        )
-    elif isinstance(config_dict["config"], list):
-        return _resolve_config_list(
-            config_dict["config"], current_dict, parent, search_paths
-        )
-    elif isinstance(config_dict["config"], dict):
-        return _resolve_config_dict(
-            config_dict["config"], current_dict, parent, search_paths
-        )
-    else:
-        raise TypeError(f"Can't parse element of type {type(config_dict['config'])}")
+    _check_config_value(config_dict["config"])
+    return _load_config_files(config_dict["config"], current_dict, parent, search_paths)
+
+
+def _check_config_value(config: Any) -> None:
+    if not isinstance(config, (str, list, dict)):
+        raise TypeError(f"Can't parse element of type {type(config)}")
 
 
-def _resolve_config_dict(
-    config_dict: list, current_dict: dict, parent: str, search_paths: List[str]
+def _load_config_files(
+    config: Any,
+    current_dict: dict,
+    parent: Optional[str],
+    search_paths: Optional[List[str]],
 ) -> dict:
-    for ns, element in config_dict.items():
-        if ns not in current_dict:
-            current_dict[ns] = {}
-        if isinstance(element, str):
-            current_dict[ns] = load_config_from_file(
-                element, current_dict[ns], parent, search_paths
-            )
+    """Load the files referenced by a config value and merge them into current_dict.
+
+    The config value can be a path, a list of config values, or a dictionary mapping
+    namespaces to config values. The include graph is traversed with an explicit
+    worklist. Each file is merged after its own parents (i.e., the ones from its
+    config key), later files in a list overwrite earlier ones.
+
+    Files that appear multiple times in the include graph (e.g., a common parent of
+    two parents) are only read and processed once, but are still merged at every
+    position they appear at. Files including themselves (transitively) raise a
+    ValueError.
+
+    Args:
+        config: Config value, i.e., the value of a config key.
+        current_dict: Current configuration dictionary. Will not be modified.
+        parent: Parent directory. Used to resolve relative paths.
+        search_paths:
+            Search paths used to resolve config files.
+            See resolve_path for more information.
+
+    Returns:
+        Updated configuration dictionary.
+    """
+    resolved_paths = {}  # (path, parent) -> full path
+    file_dicts = {}  # full path -> (parsed file, needs resolving), shared with cache
+    processed_dicts = {}  # full path -> file without config key, paths resolved
+
+    # all files are merged in place into a single copy of current_dict
+    current_dict = _fast_deepcopy(current_dict)
+
+    # items are (is_merge, namespace, element, parent, including)
+    # is_merge == False: element is a config value whose files still need to be loaded
+    #   including contains the full paths of the files that (transitively) include it
+    # is_merge == True: element is the full path of a file whose parents have all been
+    #   merged already (parent is its directory), or None to only add the namespace
+    stack = [(False, (), config, parent, ())]
+    while stack:
+        is_merge, namespace, element, parent, including = stack.pop()
+        if is_merge and element is None:
+            _merge_into_namespace(current_dict, namespace, {})
+        elif is_merge:
+            if element not in processed_dicts:
+                file_dict, needs_resolving = file_dicts[element]
+                if "config" in file_dict:
+                    file_dict = dict(file_dict)  # shared with the cache
+                    del file_dict["config"]
+                if needs_resolving:
+                    file_dict = load_config(file_dict, None, parent, search_paths)
+                processed_dicts[element] = file_dict
+            _merge_into_namespace(current_dict, namespace, processed_dicts[element])
+        elif isinstance(element, str):
+            if (element, parent) not in resolved_paths:
+                resolved_paths[element, parent] = resolve_path(
+                    element, parent, search_paths
+                )
+            full_path = resolved_paths[element, parent]
+            if full_path in including:
+                # the worklist would never become empty otherwise
+                start = including.index(full_path)
+                cycle = including[start:] + (full_path,)
+                raise ValueError(f"Circular config: {' -> '.join(cycle)}")
+            if full_path not in file_dicts:
+                file_dicts[full_path] = _load_yaml_file(full_path)
+            file_dict = file_dicts[full_path][0]
+            if not isinstance(file_dict, dict):
+                raise TypeError(f"Config file {full_path} does not contain a mapping")
+            file_parent = _dirname(full_path)
+            stack.append((True, namespace, full_path, file_parent, ()))
+            if "config" in file_dict:
+                # parents are on top of the stack, hence, they are merged first
+                _check_config_value(file_dict["config"])
+                file_config = file_dict["config"]
+                file_including = including + (full_path,)
+                stack.append(
+                    (False, namespace, file_config, file_parent, file_including)
+                )
         elif isinstance(element, list):
-            current_dict[ns] = _resolve_config_list(
-                element, current_dict[ns], parent, search_paths
+            stack.extend(
+                (False, namespace, e, parent, including) for e in reversed(element)
             )
         elif isinstance(element, dict):
-            current_dict[ns] = _resolve_config_dict(
-                element, current_dict[ns], parent, search_paths
-            )
+            for ns, e in reversed(list(element.items())):
+                ns_namespace = namespace + (ns,)
+                stack.append((False, ns_namespace, e, parent, including))
+                stack.append((True, ns_namespace, None, None, ()))
+
     return current_dict
 
 
-def _resolve_config_list(
-    config_list: list, current_dict: dict, parent: str, search_paths: List[str]
-) -> dict:
-    for element in config_list:
-        if isinstance(element, str):
-            current_dict = load_config_from_file(
-                element, current_dict, parent, search_paths
-            )
-        elif isinstance(element, list):
-            current_dict = _resolve_config_list(
-                element, current_dict, parent, search_paths
+def _merge_into_namespace(dst: dict, namespace: tuple, src: dict) -> None:
+    """Merge a dictionary into a (nested) namespace of another one in place.
+
+    Missing namespaces are added. See _merge_into for details.
+
+    Args:
+        dst: The dictionary to update.
+        namespace: Keys of the nested namespace. Empty tuple for no namespace.
+        src: The dictionary to merge into the namespace of dst. Will not be modified.
+    """
+    for ns in namespace:
+        dst = dst.setdefault(ns, {})
+    _merge_into(dst, src)
+
+
+def _set_nested_value(config_dict: dict, hierarchy: List[str], value: Any) -> None:
+    """Set a nested value in a config dictionary in place.
+
+    Same result as merging {hierarchy[0]: {hierarchy[1]: {...: value}}} into
+    config_dict, without building the nested dictionary and copying config_dict.
+
+    Args:
+        config_dict: Configuration dictionary to modify.
+        hierarchy: Keys of the nested value, i.e., a dotted argument split at the dots.
+        value: Value to set. Merged with the current value if both are dicts.
+    """
+    current_dict = config_dict
+    for key in hierarchy[:-1]:
+        next_dict = current_dict.get(key)
+        if not isinstance(next_dict, dict):
+            next_dict = current_dict[key] = {}
+        current_dict = next_dict
+    key = hierarchy[-1]
+    current_value = current_dict.get(key)
+    if isinstance(current_value, dict) and isinstance(value, dict):
+        _merge_into(current_value, value)
+    else:
+        current_dict[key] = value
+
+
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+
+def _fast_deepcopy(obj: Any, memo: Optional[dict] = None) -> Any:
+    """Create a deep copy of a configuration.
+
+    Faster than copy.deepcopy for the plain dicts, lists and scalars that make up
+    configurations. Other types are copied with copy.deepcopy.
+
+    Like copy.deepcopy, objects contained multiple times (e.g., from YAML aliases)
+    are only copied once, which also handles recursive objects.
+
+    Args:
+        obj: The object to copy.
+        memo: Copies by id of the copied objects. Compatible with copy.deepcopy.
+
+    Returns:
+        Deep copy of the object.
+    """
+    if type(obj) in _IMMUTABLE_TYPES:
+        return obj
+    if memo is None:
+        memo = {}
+    elif id(obj) in memo:
+        return memo[id(obj)]
+    # scalars are handled in the loops, which avoids a call per leaf
+    if type(obj) is dict:
+        copied = memo[id(obj)] = {}
+        for key, value in obj.items():
+            copied[key] = (
+                value
+                if type(value) in _IMMUTABLE_TYPES
+                else _fast_deepcopy(value, memo)
             )
-        elif isinstance(element, dict):
-            current_dict = _resolve_config_dict(
-                element, current_dict, parent, search_paths
+        return copied
+    elif type(obj) is list:
+        copied = memo[id(obj)] = []
+        for value in obj:
+            copied.append(
+                value
+                if type(value) in _IMMUTABLE_TYPES
+                else _fast_deepcopy(value, memo)
             )
-    return current_dict
+        return copied
+    return copy.deepcopy(obj, memo)
 
 
-def _merge_dictionaries(start_dict: dict, added_dict: dict) -> dict:
+def _merge_dictionaries(
+    start_dict: dict, added_dict: dict, copy_start_values: bool = True
+) -> dict:
     """Create a dictionary by merging one into another.
 
     Keys present in start_dict will be overwritten by added_dict.
 
+    The merged dictionary starts as a shallow copy of start_dict, which copies the
+    hash table at once instead of growing it key by key. Values of start_dict are
+    only copied if they are not overwritten by added_dict. Values of added_dict are
+    not copied.
+
     Args:
-        start_dict: The starting dictionary.
+        start_dict: The starting dictionary. Will not be modified.
         added_dict: The dictionary to merge into current_dictionary.
+        copy_start_values:
+            Whether values of start_dict are copied. If False, the merged dictionary
+            shares them with start_dict, which should not be used afterwards.
 
     Returns:
         The merged dictionary.
     """
-    merged_dictionary = copy.deepcopy(start_dict)
-    for key, value in added_dict.items():
-        if (
-            key in start_dict
-            and isinstance(start_dict[key], dict)
-            and isinstance(added_dict[key], dict)
-        ):
-            merged_dictionary[key] = _merge_dictionaries(
-                start_dict[key], added_dict[key]
-            )
-        else:
-            merged_dictionary[key] = value
+    if not start_dict and type(added_dict) is dict:
+        # common case, e.g., dicts without included keys in _resolve_recursively
+        return dict(added_dict)
+    merged_dictionary = dict(start_dict)
+    # nested dictionaries present in both are merged iteratively
+    # items are (merged, start, added), merged starts as a shallow copy of start
+    stack = [(merged_dictionary, start_dict, added_dict)]
+    memo = {}  # shared values are copied once, see _fast_deepcopy
+    while stack:
+        merged, start, added = stack.pop()
+        if copy_start_values:
+            for key, value in start.items():
+                if key not in added and type(value) not in _IMMUTABLE_TYPES:
+                    merged[key] = _fast_deepcopy(value, memo)
+        for key, value in added.items():
+            start_value = start.get(key)  # None if missing, i.e., not a dict
+            if isinstance(start_value, dict) and isinstance(value, dict):
+                merged[key] = dict(start_value)
+                stack.append((merged[key], start_value, value))
+            else:
+                merged[key] = value
     return merged_dictionary
 
 
-def _resolve_include_tags_recursively(
-    config: Any, parent: str, search_paths: Optional[List[str]]
+def _merge_into(dst: dict, src: dict) -> None:
+    """Merge a dictionary into another one in place.
+
+    Keys present in dst will be overwritten by src, nested dictionaries present in
+    both are merged recursively. Values of src are copied, so dst and src can be
+    modified independently afterwards.
+
+    Args:
+        dst: The dictionary to update.
+        src: The dictionary to merge into dst. Will not be modified.
+    """
+    if not src:
+        # e.g., namespaces without content in _load_config_files
+        return
+    if not dst and type(src) is dict:
+        # e.g., the first file merged into a namespace, nothing to merge with
+        # (update would also accept other iterables, such as lists of pairs)
+        dst.update(_fast_deepcopy(src))
+        return
+    # nested dictionaries present in both are merged iteratively
+    stack = [(dst, src)]
+    memo = {}  # shared values are copied once, see _fast_deepcopy
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            dst_value = dst.get(key)  # None if missing, i.e., not a dict
+            if isinstance(dst_value, dict) and isinstance(value, dict):
+                stack.append((dst_value, value))
+            else:
+                dst[key] = _fast_deepcopy(value, memo)
+
+
+def _resolve_recursively(
+    config: Any, parent: str, search_paths: Optional[List[str]], resolve_paths: bool
 ) -> Any:
-    """Handle !include tags in object.
+    """Handle !include tags and relative paths in object.
 
     If a value has an !include tag it will be replaced by the content of the file.
     If a key has an !include tag, the configuration will be merged into the current
     dict.
 
+    If resolve_paths is True, relative paths in values of (nested) dicts are resolved
+    relative to parent. Only strings starting with ./, ../, ~/ are handled, since
+    general strings might otherwise be falsely handled as paths. Paths in lists and
+    in included files (which are resolved relative to their own parent) are not
+    changed.
+
     Args:
         config:
             Configuration for which !include tags are resolved recursively.
             Will not be modified.
         parent: Parent directory.
         search_paths: Search paths used to resolve config files.
+        resolve_paths: Whether to resolve relative paths.
 
     Returns:
-        Clone of the configuration dictionary with resolved !include tags.
+        Clone of the configuration dictionary with resolved !include tags and paths.
     """
-    config = copy.deepcopy(config)
     if isinstance(config, dict):
         included_config = {}  # this is to merge all files included as keys in order
-        for key in list(config.keys()):
-            if isinstance(key, _YAMLComments.TaggedScalar) and key.tag == "!include":
+        resolved_config = {}
+        for key, value in config.items():
+            if isinstance(key, _IncludeTag):
                 included_config = _resolve_include_tagged_scalar(
                     key, included_config, parent=parent, search_paths=search_paths
                 )
-                del config[key]
+            elif type(value) in _IMMUTABLE_TYPES:
+                # scalars are handled here, which avoids a call per leaf
+                if (
+                    resolve_paths
+                    and type(value) is str
+                    and value.startswith(("./", "../", "~/"))
+                ):
+                    if value[0] == "~":
+                        value = _os.path.expanduser(value)
+                    else:
+                        value = _os.path.normpath(_join(parent, value))
+                resolved_config[key] = value
             else:
-                config[key] = _resolve_include_tags_recursively(
-                    config[key], parent, search_paths=search_paths
+                resolved_config[key] = _resolve_recursively(
+                    value, parent, search_paths, resolve_paths
                 )
         # now merge the key includes with the remaining resolved dict, the latter is
         # winning as its more specific
-        return _merge_dictionaries(included_config, config)
+        return _merge_dictionaries(included_config, resolved_config)
     elif isinstance(config, list):
-        for i in range(len(config)):
-            config[i] = _resolve_include_tags_recursively(
-                config[i], parent, search_paths=search_paths
+        return [
+            (
+                element
+                if type(element) in _IMMUTABLE_TYPES
+                else _resolve_recursively(element, parent, search_paths, False)
             )
-    elif isinstance(config, _YAMLComments.TaggedScalar) and config.tag == "!include":
+            for element in config
+        ]
+    elif isinstance(config, _IncludeTag):
         return _resolve_include_tagged_scalar(
             config, None, parent=parent, search_paths=search_paths
         )
 
-    return config
+    return _fast_deepcopy(config)
 
 
 def _resolve_include_tagged_scalar(
-    tagged_value: _YAMLComments.TaggedScalar,
+    tagged_value: _IncludeTag,
     current_dict: dict,
     parent: str,
     search_paths: Optional[List[str]],
@@ -417,20 +1011,3 @@ def _resolve_include_tagged_scalar(
             file_path, current_dict, parent=parent, search_paths=search_paths
         )
     return merged_config
-
-
-def _resolve_paths_recursively(config_dict: dict, parent: str) -> None:
-    """Resolve relative paths in values of config dict.
-
-    Only strings starting with ./, ../, ~/ are handled, since general strings might
-    otherwise be falsely handled as paths.
-    """
-    for key, value in config_dict.items():
-        if isinstance(config_dict[key], dict):
-            _resolve_paths_recursively(config_dict[key], parent)
-        elif isinstance(value, str) and (
-            value.startswith("./") or value.startswith("../")
-        ):
-            config_dict[key] = _os.path.normpath(_os.path.join(parent, value))
-        elif isinstance(value, str) and value.startswith("~/"):
-            config_dict[key] = _os.path.expanduser(value)